@@ -1,23 +0,0 @@
-# DRF Import's
-from rest_framework import serializers
-
-# App Import's
-from mqtt_service.models import Topic, Message, Subscription
-
-class TopicSerializer(serializers.ModelSerializer):
-
-    class Meta:
-        model = Topic
-        fields = '__all__'
-
-class SubscriptionSerializer(serializers.ModelSerializer):
-
-    class Meta:
-        model = Subscription
-        fields = '__all__'
-
-class MessageSerializer(serializers.ModelSerializer):
-    
-    class Meta:
-        model = Message
-        fields = '__all__'
\ No newline at end of file
@@ -3,11 +3,14 @@ from django.apps import AppConfig
 from django.conf import settings
 
 # App Imports
-from mqtt_service.mqtt_client import MqttService
+from mqtt_service.mqtt_client import MqttService, get_message_model
 
 # Default Package Imports
 import asyncio
+import atexit
 import logging
+import os
+import sys
 import threading
 
 # Initialize Logger
@@ -17,6 +20,9 @@ class MqttServiceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mqtt_service'
 
+    mqtt_service = None
+    mqtt_loop = None
+
     def ready(self):
         """
         Starts the MQTT service when the Django app is loaded.
@@ -24,14 +30,33 @@ class MqttServiceConfig(AppConfig):
         - In production, MQTT should run as a separate service.
         """
 
+        # Register signal handlers
+        import mqtt_service.signals  # noqa: F401
+
         if not getattr(settings, "MQTT_AUTO_START", settings.DEBUG):
             logger.info("MQTT Service will not start inside Django (Production mode).")
             return  # Don't start inside Django in production.
 
+        if self.is_autoreloader_parent():
+            return  # The reloaded child process starts its own MQTT service.
+
         if not hasattr(self, "_mqtt_started"):  # Prevent multiple starts in dev
             self._mqtt_started = True
             thread = threading.Thread(target=self.run_mqtt_service, daemon=True)
             thread.start()
+            atexit.register(self.stop_mqtt_service)
+
+    @staticmethod
+    def is_autoreloader_parent():
+        """
+        Returns True in the process that only watches files for `runserver`'s
+        autoreloader; the server itself runs in a child with RUN_MAIN set.
+        """
+        return (
+            "runserver" in sys.argv
+            and "--noreload" not in sys.argv
+            and os.environ.get("RUN_MAIN") != "true"
+        )
 
     def run_mqtt_service(self):
         """Runs the MQTT service in a dedicated event loop thread."""
@@ -39,17 +64,43 @@ class MqttServiceConfig(AppConfig):
         asyncio.set_event_loop(loop)
         loop.run_until_complete(self.start_mqtt_service())
 
+        # The MQTT client is served by this event loop, keep it running
+        if self.mqtt_service is not None:
+            self.mqtt_loop = loop
+            loop.run_forever()
+
     async def start_mqtt_service(self):
         """Starts the MQTT service asynchronously."""
         broker = getattr(settings, "MQTT_BROKER", "mqtt.example.com")
         port = getattr(settings, "MQTT_PORT", 1883)
         username = getattr(settings, "MQTT_USER", "your_user")
         password = getattr(settings, "MQTT_PASS", "your_pass")
+        payload_format = getattr(settings, "MQTT_PAYLOAD_FORMAT", "json")
 
-        mqtt_service = MqttService(broker=broker, port=port)
+        mqtt_service = MqttService(broker=broker, port=port, payload_format=payload_format)
 
         try:
             await mqtt_service.connect(username=username, password=password)
+            self.mqtt_service = mqtt_service
             logger.info("MQTT Service started successfully.")
-        except Exception as e:
-            logger.error(f"Failed to start MQTT service: {e}")
+        except Exception:
+            logger.exception("Failed to start MQTT service")
+
+    def stop_mqtt_service(self):
+        """Disconnects the MQTT service on interpreter shutdown."""
+        if self.mqtt_loop is None or not self.mqtt_loop.is_running():
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self.mqtt_service.disconnect(), self.mqtt_loop)
+        try:
+            unsaved = future.result(timeout=5)
+
+            # The async ORM's thread pools are already shut down at exit, store the rest from here
+            if unsaved:
+                get_message_model().objects.bulk_create(
+                    unsaved, batch_size=MqttService.MESSAGE_BATCH_SIZE, ignore_conflicts=True
+                )
+            logger.info("MQTT Service stopped.")
+        except Exception:
+            logger.exception("Failed to stop MQTT service cleanly")
+        self.mqtt_loop.call_soon_threadsafe(self.mqtt_loop.stop)
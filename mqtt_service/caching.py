@@ -0,0 +1,22 @@
+# Django Import's
+from django.core.cache import cache
+from django.db import transaction
+
+# Cached subscription lists rendered as JSON, per user and per topic
+USER_SUBSCRIPTIONS_KEY = "user_subs_json:{}"
+TOPIC_SUBSCRIBERS_KEY = "topic_subs_json:{}"
+SUBSCRIPTIONS_CACHE_TIMEOUT = 300
+
+def invalidate_subscriptions(user_ids=(), topic_ids=()):
+    """
+    Drops the cached subscription lists of the given users and topics.
+
+    Args:
+        user_ids: IDs of users whose subscriptions changed.
+        topic_ids: IDs of topics whose subscribers changed.
+    """
+    keys = [USER_SUBSCRIPTIONS_KEY.format(user_id) for user_id in user_ids if user_id is not None]
+    keys += [TOPIC_SUBSCRIBERS_KEY.format(topic_id) for topic_id in topic_ids if topic_id is not None]
+    # Deleted once committed, a read racing the writer's transaction would cache the old rows again
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
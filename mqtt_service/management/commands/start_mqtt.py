@@ -3,7 +3,7 @@ from django.core.management.base import BaseCommand
 from django.conf import settings
 
 # App Imports
-from mqtt_service.mqtt_client import MqttService
+from mqtt_service.mqtt_client import MqttService, use_persistent_db_connections
 
 # Package Imports
 import asyncio
@@ -15,5 +15,15 @@ class Command(BaseCommand):
         asyncio.run(self.start_mqtt())
 
     async def start_mqtt(self):
-        mqtt_service = MqttService(broker = settings.MQTT_BROKER, port = settings.MQTT_PORT)
+        # Long-running worker without requests, don't reconnect to the database per query
+        use_persistent_db_connections()
+
+        mqtt_service = MqttService(
+            broker = settings.MQTT_BROKER,
+            port = settings.MQTT_PORT,
+            payload_format = getattr(settings, "MQTT_PAYLOAD_FORMAT", "json"),
+        )
         await mqtt_service.connect(username = settings.MQTT_USER, password = settings.MQTT_PASSWORD)
+
+        # The MQTT client is served by this event loop, keep it running
+        await asyncio.Event().wait()
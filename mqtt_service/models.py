@@ -1,5 +1,6 @@
 # Django Import's
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 
 # Default Package Import's
@@ -16,9 +17,15 @@ class Topic(models.Model):
     is_group = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
 
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)  
 
+    class Meta:
+        indexes = [
+            # Partial index for `subscribe_all`, which only reads active topics
+            models.Index(fields=["is_active"], condition=Q(is_active=True), name="topic_active_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -30,26 +37,41 @@ class Subscription(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
+    # Lookups by user use the (user, topic) unique index, lookups by topic use
+    # `sub_topic_user_idx`, so separate single-column FK indexes would be redundant.
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, blank=True, null=True, on_delete=models.SET_NULL, related_name="subscriptions"
+        settings.AUTH_USER_MODEL, blank=True, null=True, on_delete=models.SET_NULL, related_name="subscriptions",
+        db_index=False,
     )   
     topic = models.ForeignKey(
-        Topic, blank=True, null=True, on_delete=models.SET_NULL, related_name="subscriptions"
+        Topic, blank=True, null=True, on_delete=models.SET_NULL, related_name="subscriptions",
+        db_index=False,
     )   
 
-    subscribed_at = models.DateTimeField(auto_now_add=True)
+    # Unsubscribing clears the flag instead of deleting the row
+    is_active = models.BooleanField(default=True)
+
+    subscribed_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True) 
 
     class Meta:
         unique_together = ('user', 'topic')
+        indexes = [
+            models.Index(fields=["topic", "user"], name="sub_topic_user_idx"),
+            # Partial index for the per-user lookups, which only read active subscriptions
+            models.Index(fields=["user"], condition=Q(is_active=True), name="sub_active_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.topic.name}"
     
 class Message(models.Model):
-    """🔥 Represents messages published to MQTT topics."""
+    """
+    🔥 Represents messages published to MQTT topics.
+    🔥 Uses a sequential primary key for cheap inserts, `public_id` is the externally exposed ID.
+    """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    public_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
 
     content = models.TextField(blank=True, null=True)
 
@@ -62,6 +84,9 @@ class Message(models.Model):
     topic = models.ForeignKey(
         Topic,  blank=True, null=True, related_name="message", on_delete=models.SET_NULL
     )  
+    # MQTT topic the message was received on, stored as-is so the MQTT worker
+    # doesn't need a Topic lookup per message; `topic` is filled in from it later.
+    topic_name = models.CharField(max_length=255, blank=True, default="", db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True) 
     updated_at = models.DateTimeField(auto_now=True)    
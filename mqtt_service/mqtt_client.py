@@ -1,43 +1,145 @@
 # Django Import's
 from django.apps import apps
-from django.contrib.auth import get_user_model
-from django.core.exceptions import ObjectDoesNotExist
+from django.contrib import auth
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist, ValidationError
+from django.db import (
+    DatabaseError, DataError, IntegrityError, InterfaceError, OperationalError, close_old_connections, connections,
+)
+
+# Default Package Import's
+import logging
+import asyncio
+import uuid
+from functools import lru_cache
+import orjson
+from asgiref.sync import sync_to_async
+import paho.mqtt.client as mqtt
 
 # App Import's
+# Models are resolved lazily (the app registry isn't ready at import time)
+# and cached, so the hot message path skips the registry lookup.
+@lru_cache(maxsize=1)
+def get_user_model():
+    return auth.get_user_model()
+
+@lru_cache(maxsize=1)
 def get_topic_model():
     return apps.get_model('mqtt_service', 'Topic')
 
+@lru_cache(maxsize=1)
 def get_message_model():
     return apps.get_model('mqtt_service', 'Message')
 
-
-# Default Package Import's
-import logging
-import asyncio
-from asgiref.sync import async_to_sync, sync_to_async
-import paho.mqtt.client as mqtt
-
 # Initialize Logger
 logger = logging.getLogger(__name__)
 
+def use_persistent_db_connections():
+    """
+    Keeps database connections open for the lifetime of the process.
+
+    Django only recycles connections around HTTP requests, a dedicated MQTT
+    worker has none, so with the default CONN_MAX_AGE=0 any call to
+    `close_old_connections` would reconnect. Only call this in a standalone
+    worker, never in a process that also serves requests.
+    """
+    for connection in connections.all():
+        connection.settings_dict["CONN_MAX_AGE"] = None
+
 class MqttService:
+
+    # Received messages are written in batches of at most this many rows ...
+    MESSAGE_BATCH_SIZE = 500
+    # ... or whatever has been buffered after this many seconds.
+    MESSAGE_FLUSH_INTERVAL = 0.05
+
+    # Seconds before retrying a batch while the database is unreachable, doubled up to the maximum
+    STORE_RETRY_DELAY = 0.5
+    STORE_RETRY_MAX_DELAY = 30
+
+    # Incoming packets buffered between paho and the handler workers; newer ones are dropped when full
+    INBOX_SIZE = 10_000
+    # Number of coroutines processing incoming packets concurrently
+    INBOX_WORKERS = 8
+
+    # Seconds between runs of `_reconcile_topics`
+    TOPIC_RECONCILE_INTERVAL = 5
+
+    # Topics per SUBSCRIBE packet in `subscribe_all`
+    SUBSCRIBE_BATCH_SIZE = 1000
+
+    # User IDs fetched per query while broadcasting a notification
+    BROADCAST_CHUNK_SIZE = 5000
+
+    # Seconds between reconnect attempts after losing the broker
+    RECONNECT_DELAY = 5
     
-    def __init__(self, broker: str, port: int = 1883):
+    def __init__(self, broker: str, port: int = 1883, publisher_pool_size: int = 3, payload_format: str = "json"):
         """
         Initializes the MQTT service.
 
         Args:
             broker (str): The MQTT broker address.
             port (int, optional): The MQTT broker port (default: 1883).
+            publisher_pool_size (int, optional): Number of connections outgoing messages
+                are spread over by topic (default: 3).
+            payload_format (str, optional): Wire format of incoming chat payloads,
+                "json" or "msgpack" (default: "json"). "msgpack" requires `ormsgpack`.
         """
         self.broker = broker
         self.port = port
+
+        # Decoder for incoming payloads, both read the raw bytes directly
+        if payload_format == "json":
+            self._decode_payload, self._decode_error = orjson.loads, orjson.JSONDecodeError
+        elif payload_format == "msgpack":
+            try:
+                import ormsgpack
+            except ImportError:
+                raise ImproperlyConfigured("The msgpack payload format requires the ormsgpack package.")
+            self._decode_payload, self._decode_error = ormsgpack.unpackb, ormsgpack.MsgpackDecodeError
+        else:
+            raise ImproperlyConfigured(f"Unknown MQTT payload format: {payload_format}")
+
+        # Dedicated connection for subscriptions and incoming messages
         self.client = mqtt.Client()
+
+        # Paho sends everything of a client over one socket, so spread publishes over several.
+        # Each topic sticks to one of them, see `_publisher_for`.
+        self.publishers = [mqtt.Client() for _ in range(publisher_pool_size)]
+
+        # Raw (topic, payload) packets from `on_message`, drained by `_inbox_worker`
+        self.inbox = asyncio.Queue(maxsize=self.INBOX_SIZE)
+        self._worker_tasks = []
+
+        # IDs of topics known to exist in the database, and of topics messages
+        # arrived on that `_reconcile_topics` still has to create / link
+        self._known_topics: set[str] = set()
+        self._pending_topics: set[str] = set()
+        self._reconciler_task = None
+
+        # Buffer of unsaved Message instances, drained by `_flush_messages`
+        self._msg_buffer = asyncio.Queue()
+        self._flush_batch = []
+        self._flusher_task = None
+
+        # Event loop `connect` runs on; paho's network I/O is driven from it
+        self._loop = None
+        self._misc_tasks = {}
+        self._tasks = set()
         
         # Attach event handlers
         self.client.on_connect = self.on_connect  
         self.client.on_message = self.on_message  
 
+        for client in (self.client, *self.publishers):
+            client.on_disconnect = self.on_disconnect
+
+            # Let the event loop watch paho's socket instead of running paho's network thread
+            client.on_socket_open = self.on_socket_open
+            client.on_socket_close = self.on_socket_close
+            client.on_socket_register_write = self.on_socket_register_write
+            client.on_socket_unregister_write = self.on_socket_unregister_write
+
     async def get_user(self, id: int):
         """
         Fetches a user by ID asynchronously.
@@ -50,9 +152,9 @@ class MqttService:
         """
         user_model = get_user_model()
         try:
-            return await asyncio.to_thread(user_model.objects.get, id=id)
+            return await user_model.objects.aget(id=id)
         except ObjectDoesNotExist:
-            logger.warning(f"User with ID {id} not found.")
+            logger.warning("User with ID %s not found.", id)
             return None 
 
     async def connect(self, username: str, password: str):
@@ -66,12 +168,327 @@ class MqttService:
         Returns:
             None
         """
-        self.client.username_pw_set(username, password)
-        
-        # Run connect_async in a separate thread to avoid blocking
-        await asyncio.to_thread(self.client.connect_async, self.broker, self.port, 60)
+        self._loop = asyncio.get_running_loop()
+        clients = (self.client, *self.publishers)
+
+        for client in clients:
+            client.username_pw_set(username, password)
         
-        self.client.loop_start()  # Start the loop in a non-blocking way
+        # Run connect in separate threads to avoid blocking on DNS / TCP setup,
+        # from then on the sockets are served by the event loop (see `on_socket_open`)
+        await asyncio.gather(
+            *(asyncio.to_thread(client.connect, self.broker, self.port, 60) for client in clients)
+        )
+
+        # Start the handlers and the background writer for received messages
+        if not self._worker_tasks:
+            self._worker_tasks = [asyncio.create_task(self._inbox_worker()) for _ in range(self.INBOX_WORKERS)]
+        if self._flusher_task is None:
+            self._flusher_task = asyncio.create_task(self._flush_messages())
+        if self._reconciler_task is None:
+            self._reconciler_task = asyncio.create_task(self._reconcile_topics())
+
+    async def disconnect(self):
+        """
+        Stops the background tasks, stores still buffered messages and
+        disconnects from the MQTT broker.
+
+        Returns:
+            list: Buffered Message instances that could not be stored, e.g. because
+                the thread pools used by the async ORM are already shut down.
+        """
+        tasks = [task for task in (*self._worker_tasks, self._flusher_task, self._reconciler_task) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks, self._flusher_task, self._reconciler_task = [], None, None
+
+        # Whatever the writer was holding plus what is still queued
+        unsaved, self._flush_batch = self._flush_batch, []
+        while not self._msg_buffer.empty():
+            unsaved.append(self._msg_buffer.get_nowait())
+
+        if unsaved:
+            Message = get_message_model()
+            try:
+                await Message.objects.abulk_create(unsaved, batch_size=self.MESSAGE_BATCH_SIZE, ignore_conflicts=True)
+                unsaved = []
+            except Exception as e:
+                logger.warning("Could not store %s buffered messages: %s", len(unsaved), e)
+
+        for client in (self.client, *self.publishers):
+            client.disconnect()
+
+        return unsaved
+
+    async def _inbox_worker(self):
+        """
+        Background task that processes incoming packets from the inbox.
+        """
+        while True:
+            topic_id, payload = await self.inbox.get()
+            try:
+                await self.handle_incoming_message(topic_id, payload)
+            finally:
+                self.inbox.task_done()
+
+    async def _drain(self, max_items: int, timeout: float):
+        """
+        Waits for at least one buffered message, then collects more until
+        `max_items` are gathered or `timeout` seconds have passed.
+
+        Args:
+            max_items (int): Maximum number of messages to return.
+            timeout (float): Seconds to keep collecting after the first message.
+
+        Returns:
+            list: Unsaved Message instances, also kept as `_flush_batch` until stored.
+        """
+        batch = self._flush_batch = [await self._msg_buffer.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while len(batch) < max_items:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._msg_buffer.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _flush_messages(self):
+        """
+        Background task that stores buffered messages with one bulk INSERT per batch.
+        """
+        Message = get_message_model()
+
+        while True:
+            batch = await self._drain(max_items=self.MESSAGE_BATCH_SIZE, timeout=self.MESSAGE_FLUSH_INTERVAL)
+
+            # Link messages whose topic got reconciled while they were buffered
+            for message in batch:
+                if message.topic_id is None and message.topic_name in self._known_topics:
+                    message.topic_id = message.topic_name
+
+            try:
+                await Message.objects.abulk_create(batch, batch_size=self.MESSAGE_BATCH_SIZE, ignore_conflicts=True)
+                logger.info("✅ Stored %s messages.", len(batch))
+            except Exception as e:
+                logger.warning("⚠️ Error storing %s messages, retrying: %s", len(batch), e)
+                await self._recycle_db_connections()
+                await self._store_failed_batch(batch)
+
+            self._flush_batch = []
+
+    async def _store_failed_batch(self, batch):
+        """
+        Stores a batch whose bulk INSERT failed, so only the rows that fail themselves are lost.
+
+        - Unlinks messages from topics deleted since they were recorded as known.
+        - Retries the batch with backoff while the database is unreachable, the
+          batch stays in `_flush_batch` meanwhile.
+        - Stores it row by row if a row's data is rejected.
+
+        Args:
+            batch (list): Unsaved Message instances.
+        """
+        Topic = get_topic_model()
+        Message = get_message_model()
+        delay = self.STORE_RETRY_DELAY
+
+        while True:
+            try:
+                # A topic deleted through the API stays in `_known_topics`, its FK fails the whole INSERT
+                topic_ids = {message.topic_id for message in batch if message.topic_id is not None}
+                existing = {
+                    str(topic_id)
+                    async for topic_id in Topic.objects.filter(pk__in=topic_ids).values_list("pk", flat=True)
+                }
+                deleted = topic_ids - existing
+                if deleted:
+                    self._known_topics -= deleted
+                    for message in batch:
+                        if message.topic_id in deleted:
+                            message.topic_id = None
+
+                await Message.objects.abulk_create(batch, batch_size=self.MESSAGE_BATCH_SIZE, ignore_conflicts=True)
+                logger.info("✅ Stored %s messages.", len(batch))
+                return
+            except (OperationalError, InterfaceError) as e:
+                # Every row would fail the same way, keep the batch until the database is back
+                logger.warning("⚠️ Database unavailable, retrying %s messages in %ss: %s", len(batch), delay, e)
+                await self._recycle_db_connections()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.STORE_RETRY_MAX_DELAY)
+            except (IntegrityError, DataError) as e:
+                logger.warning("⚠️ Error storing %s messages, storing them one by one: %s", len(batch), e)
+                break
+            except Exception as e:
+                logger.error("❌ Error storing %s messages, dropping them: %s", len(batch), e)
+                await self._recycle_db_connections()
+                return
+
+        failed = 0
+        for message in batch:
+            try:
+                await Message.objects.abulk_create([message], ignore_conflicts=True)
+            except Exception as e:
+                failed += 1
+                logger.error("❌ Error storing message %s: %s", message.public_id, e)
+
+        if failed:
+            await self._recycle_db_connections()
+        logger.info("✅ Stored %s of %s messages.", len(batch) - failed, len(batch))
+
+    async def _reconcile_topics(self):
+        """
+        Background task that creates topics messages arrived on but which aren't
+        in the database yet, and links the already stored messages to them.
+        """
+        Topic = get_topic_model()
+        Message = get_message_model()
+
+        while True:
+            await asyncio.sleep(self.TOPIC_RECONCILE_INTERVAL)
+
+            pending, self._pending_topics = self._pending_topics, set()
+            for topic_id in pending:
+                try:
+                    await Topic.objects.aget_or_create(id=topic_id)
+                    self._known_topics.add(topic_id)
+                    await Message.objects.filter(topic_name=topic_id, topic__isnull=True).aupdate(topic_id=topic_id)
+                except Exception as e:
+                    logger.error("❌ Error reconciling topic %s: %s", topic_id, e)
+                    await self._recycle_db_connections()
+
+    async def _recycle_db_connections(self):
+        """
+        Drops database connections that became unusable (e.g. after a database
+        restart) so the next query reconnects. There are no requests around the
+        MQTT worker's queries, so Django never does this on its own.
+        """
+        # Runs in the same thread as the async ORM's queries, which owns the connections
+        await sync_to_async(close_old_connections)()
+
+    def _spawn(self, coro):
+        """
+        Schedules a coroutine on the service's event loop and keeps a
+        reference to the task until it finishes.
+
+        Args:
+            coro: The coroutine to run.
+        """
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _call_on_loop(self, callback, *args):
+        """
+        Runs a callback on the service's event loop: right away when already
+        on it, otherwise thread-safely on its next iteration.
+
+        Args:
+            callback: The function to call.
+            *args: Arguments passed to `callback`.
+        """
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+
+        if on_loop:
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def on_socket_open(self, client, userdata, sock):
+        """
+        Callback triggered when paho opens the broker socket.
+        Starts watching it for reads and starts the keepalive loop.
+        """
+        fd = sock.fileno()
+
+        def watch():
+            self._loop.add_reader(fd, client.loop_read)
+            self._misc_tasks[client] = self._loop.create_task(self._misc_loop(client))
+
+        # Paho may call this from the thread running `connect`
+        self._call_on_loop(watch)
+
+    def on_socket_close(self, client, userdata, sock):
+        """
+        Callback triggered when paho closes the broker socket.
+        """
+        # Paho closes the socket right after this returns, so keep the file descriptor number
+        fd = sock.fileno()
+
+        def unwatch():
+            self._loop.remove_reader(fd)
+            self._loop.remove_writer(fd)
+            misc_task = self._misc_tasks.pop(client, None)
+            if misc_task is not None:
+                misc_task.cancel()
+
+        # Paho also closes the socket on garbage collection, possibly after the loop is gone
+        if not self._loop.is_closed():
+            self._call_on_loop(unwatch)
+
+    def on_socket_register_write(self, client, userdata, sock):
+        """
+        Callback triggered when paho has outgoing packets waiting to be written.
+        """
+        self._call_on_loop(self._loop.add_writer, sock.fileno(), client.loop_write)
+
+    def on_socket_unregister_write(self, client, userdata, sock):
+        """
+        Callback triggered when paho's outgoing packet queue is empty.
+        """
+        self._call_on_loop(self._loop.remove_writer, sock.fileno())
+
+    async def _misc_loop(self, client):
+        """
+        Runs paho's periodic housekeeping (keepalive pings, retries) while connected.
+
+        Args:
+            client: The MQTT client instance.
+        """
+        while client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(1)
+
+    async def _reconnect(self, client):
+        """
+        Reconnects to the MQTT broker, retrying every `RECONNECT_DELAY` seconds.
+
+        Args:
+            client: The MQTT client instance.
+        """
+        while True:
+            await asyncio.sleep(self.RECONNECT_DELAY)
+            try:
+                await asyncio.to_thread(client.reconnect)
+                return
+            except OSError as e:
+                logger.warning("Reconnect to MQTT broker failed: %s", e)
+
+    def on_disconnect(self, client, userdata, rc):
+        """
+        Callback function triggered when the MQTT client disconnects from the broker.
+
+        Args:
+            client: The MQTT client instance.
+            userdata: User-defined data (not used in this case).
+            rc (int): Disconnection reason code. 0 means a requested disconnect.
+
+        Returns:
+            None
+        """
+        if rc != 0:
+            logger.warning("Unexpectedly disconnected from MQTT broker, return code %s", rc)
+            self._loop.call_soon_threadsafe(self._spawn, self._reconnect(client))
 
     def on_connect(self, client, userdata, flags, rc):
         """
@@ -88,9 +505,9 @@ class MqttService:
         """
         if rc == 0:
             logger.info("Connected to MQTT broker successfully.")
-            async_to_sync(self.subscribe_all)()
+            self._spawn(self.subscribe_all())
         else:
-            logger.error(f"Failed to connect to MQTT broker, return code {rc}")
+            logger.error("Failed to connect to MQTT broker, return code %s", rc)
            
     async def subscribe(self, topic: str):
         """
@@ -102,8 +519,30 @@ class MqttService:
         Returns:
             None
         """
-        await asyncio.to_thread(self.client.subscribe, topic)
+        # subscribe() only queues the SUBSCRIBE packet, no need for a thread
+        self.client.subscribe(topic)
          
+    def _subscribe_batch(self, topics, subscribed, failed):
+        """
+        Subscribes to a batch of topics with a single SUBSCRIBE packet.
+
+        Args:
+            topics (list): (topic, qos) tuples to subscribe to.
+            subscribed (int): Running count of subscribed topics.
+            failed (int): Running count of topics that failed to subscribe.
+
+        Returns:
+            tuple: The updated (subscribed, failed) counts.
+        """
+        # ✅ subscribe() only queues the SUBSCRIBE packet, call it directly
+        result, _ = self.client.subscribe(topics)
+
+        if result == 0:
+            return subscribed + len(topics), failed
+
+        logger.warning("Batch subscription failed with return code: %s", result)
+        return subscribed, failed + len(topics)
+
     async def subscribe_all(self):
         """
         Subscribes to all active topics in the database in batch mode.
@@ -111,28 +550,39 @@ class MqttService:
         try:
             Topic = get_topic_model()
 
-            # ✅ Run ORM query properly in async context
-            subscriptions = await sync_to_async(
-                lambda: list(Topic.objects.filter(is_active=True).values_list("id", flat=True))
-            )()
-
-            if subscriptions:
-                topics = [(str(topic_id), 0) for topic_id in subscriptions]  # QoS = 0
-
-                # ✅ Ensure the subscribe call runs in a non-async context
-                result, _ = await sync_to_async(self.client.subscribe)(topics)
-
-                if result == 0:
-                    logger.info(f"Successfully subscribed to {len(subscriptions)} topics.")
-                else:
-                    logger.warning(f"Batch subscription failed with return code: {result}")
-
-            else:
+            # ✅ Stream topic IDs and subscribe in batches instead of materializing every topic
+            active_topics = Topic.objects.filter(is_active=True).values_list("id", flat=True)
+            batch = []
+            subscribed = failed = 0
+
+            async for topic_id in active_topics.aiterator(chunk_size=self.SUBSCRIBE_BATCH_SIZE):
+                topic_id = str(topic_id)
+                self._known_topics.add(topic_id)
+                batch.append((topic_id, 0))  # QoS = 0
+                if len(batch) >= self.SUBSCRIBE_BATCH_SIZE:
+                    subscribed, failed = self._subscribe_batch(batch, subscribed, failed)
+                    batch = []
+
+            if batch:
+                subscribed, failed = self._subscribe_batch(batch, subscribed, failed)
+
+            if subscribed:
+                logger.info("Successfully subscribed to %s topics.", subscribed)
+            if failed:
+                logger.warning("Batch subscription failed for %s topics.", failed)
+            if not subscribed and not failed:
                 logger.info("No active topics found to subscribe.")
 
         except Exception as e:
-            logger.error(f"Error in subscribe_all: {e}")
+            logger.error("Error in subscribe_all: %s", e)
          
+    def _publisher_for(self, topic):
+        """
+        Returns the publisher connection for a topic. MQTT only orders messages
+        sent over the same connection, so a topic always uses the same one.
+        """
+        return self.publishers[hash(topic) % len(self.publishers)]
+
     async def publish(self, topic, message, qos=0):
         """
         Publishes a message to the given MQTT topic.
@@ -146,17 +596,17 @@ class MqttService:
                     - 2: Exactly once (ensured delivery)
         """
         try:
-            # Publish the message asynchronously in a separate thread
-            result = await asyncio.to_thread(self.client.publish, topic, message, qos)
+            # publish() only queues the packet for the network loop, call it directly
+            result = self._publisher_for(topic).publish(topic, message, qos)
 
             # Log success or failure
             if result.rc == 0:
-                logging.info(f"Message published to {topic}: {message}")
+                logger.info("Message published to %s: %s", topic, message)
             else:
-                logging.warning(f"Failed to publish message to {topic}, MQTT return code: {result.rc}")
+                logger.warning("Failed to publish message to %s, MQTT return code: %s", topic, result.rc)
 
         except Exception as e:
-            logging.error(f"Error publishing message to {topic}: {e}")
+            logger.error("Error publishing message to %s: %s", topic, e)
 
     async def notification(self, message, user=None, qos=0):
         """
@@ -171,67 +621,117 @@ class MqttService:
             if user:
                 # Send notification to a single user
                 topic = f"notification/{user.id}"
-                result = await asyncio.to_thread(self.client.publish, topic, message, qos)
+                result = self._publisher_for(topic).publish(topic, message, qos)
 
                 if result.rc == 0:
-                    logging.info(f"✅ Notification sent to {user.id} on topic {topic}")
+                    logger.info("✅ Notification sent to %s on topic %s", user.id, topic)
                 else:
-                    logging.warning(f"⚠️ Failed to send notification to {user.id}, MQTT return code: {result.rc}")
+                    logger.warning("⚠️ Failed to send notification to %s, MQTT return code: %s", user.id, result.rc)
 
             else:
                 # Broadcast to all active users
                 user_model = get_user_model()
-                users = await asyncio.to_thread(lambda: list(user_model.objects.filter(is_active=True)))
+                sent = failed = 0
 
-                # Publish the message to all users concurrently
-                tasks = [asyncio.to_thread(self.client.publish, f"notification/{u.id}", message, qos) for u in users]
-                results = await asyncio.gather(*tasks)
+                # Encode the payload once, paho would otherwise encode it again for every user
+                payload = message.encode() if isinstance(message, str) else message
 
-                for user, result in zip(users, results):
+                # publish() only queues the packet for paho's network loop, so call it inline
+                active_user_ids = user_model.objects.filter(is_active=True).values_list("id", flat=True)
+                async for user_id in active_user_ids.aiterator(chunk_size=self.BROADCAST_CHUNK_SIZE):
+                    topic = f"notification/{user_id}"
+                    result = self._publisher_for(topic).publish(topic, payload, qos)
                     if result.rc == 0:
-                        logging.info(f"✅ Broadcast notification sent to {user.id} on topic notification/{user.id}")
+                        sent += 1
                     else:
-                        logging.warning(f"⚠️ Failed to send broadcast notification to {user.id}, MQTT return code: {result.rc}")
+                        failed += 1
+
+                logger.info("✅ Broadcast notification sent to %s users", sent)
+                if failed:
+                    logger.warning("⚠️ Failed to send broadcast notification to %s users", failed)
 
         except Exception as e:
-            logging.error(f"❌ Error sending notification: {e}")
+            logger.error("❌ Error sending notification: %s", e)
 
     
-    async def handle_incoming_message(self, data):
+    @staticmethod
+    def _user_id(value):
+        """
+        Converts a user ID from the payload (e.g. "2") to the user model's
+        primary key type, which `ain_bulk` keys its result by. Returns None
+        for missing or malformed IDs.
+        """
+        if value is None:
+            return None
+        try:
+            return get_user_model()._meta.pk.to_python(value)
+        except ValidationError:
+            return None
+
+    @staticmethod
+    def _public_id(value):
+        """
+        Returns the message ID sent along by `publish_message`, or a new one
+        if the payload has none or it isn't a valid UUID.
+        """
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return uuid.uuid4()
+
+    async def handle_incoming_message(self, topic_id: str, payload: bytes):
         """
         Asynchronously processes the received MQTT message.
 
-        - Extracts topic and message payload.
-        - Ensures the topic exists in the database.
-        - Fetches sender and receiver from the database asynchronously.
-        - Stores the message asynchronously.
+        - Records the topic by name, unknown topics are created later by `_reconcile_topics`.
+        - Fetches sender and receiver from the database in one query.
+        - Queues the message for the next batched database write.
 
         Args:
-            data: The received MQTT message containing topic and payload.
+            topic_id (str): The MQTT topic the message was received on.
+            payload (bytes): The raw message payload.
         """
         
-        Topic = get_topic_model()
         Message = get_message_model()
 
-        topic_id = data.topic
-        payload = data.payload.decode()  # Convert binary payload to string
-         
+        # Parse the payload (JSON or msgpack, see `payload_format`). Kept apart from the
+        # rest, ormsgpack's decode error is a plain ValueError.
         try:
-            # Ensure the topic exists in the database, create it if necessary
-            topic, _ = await asyncio.to_thread(Topic.objects.get_or_create, id=topic_id)
-
-            # Parse the payload (assuming it's JSON)
-            import json
-            payload_data = json.loads(payload)
+            payload_data = self._decode_payload(payload)
+        except self._decode_error:
+            logger.warning("❌ Failed to decode message payload: %r", payload)
+            return
 
-            # Fetch the sender and receiver asynchronously
-            sender = await self.get_user(payload_data.get("sender"))
-            receiver = await self.get_user(payload_data.get("receiver"))
+        try:
+            # Only link the topic right away if it is known to exist, no lookup per message
+            known_topic = topic_id in self._known_topics
+            if not known_topic:
+                self._pending_topics.add(topic_id)
+
+            # Fetch the sender and receiver with a single query, only the columns used below.
+            # This also validates the IDs, an unknown one would fail the whole batched insert.
+            sender_id = self._user_id(payload_data.get("sender"))
+            receiver_id = self._user_id(payload_data.get("receiver"))
+            users = await get_user_model().objects.only("id", "first_name").ain_bulk(
+                [user_id for user_id in (sender_id, receiver_id) if user_id is not None]
+            )
+            sender = users.get(sender_id)
+            receiver = users.get(receiver_id)
             message = payload_data.get("message")
+
+            # Messages published by `publish_message` keep their id, so storing one twice is ignored
+            public_id = self._public_id(payload_data.get("public_id"))
              
-            # Store the message asynchronously in the database
-            await asyncio.to_thread(
-                Message.objects.create, topic=topic, content=message, sender=sender, receiver=receiver
+            # Queue the message; `_flush_messages` stores it in the next batch
+            self._msg_buffer.put_nowait(
+                Message(
+                    public_id=public_id,
+                    topic_name=topic_id,
+                    topic_id=topic_id if known_topic else None,
+                    content=message,
+                    sender_id=sender_id if sender else None,
+                    receiver_id=receiver_id if receiver else None,
+                )
             )
 
             # 🔹 Send notification to receiver
@@ -240,20 +740,22 @@ class MqttService:
             else:
                 await self.notification(f"New message from {sender.first_name}: {message}")
 
-            logger.info(f"✅ Message stored successfully: {payload_data.get('message')} (Topic: {topic_id})")
-
-        except json.JSONDecodeError:
-            logger.warning(f"❌ Failed to decode message payload: {payload}")
+            logger.info("✅ Message queued for storage: %s (Topic: %s)", message, topic_id)
 
+        except DatabaseError as e:
+            logger.warning("❌ Error processing MQTT message: %s", e)
+            # Only a failed query can leave the connection unusable
+            await self._recycle_db_connections()
         except Exception as e:
-            logger.warning(f"❌ Error processing MQTT message: {e}")
+            logger.warning("❌ Error processing MQTT message: %s", e)
 
     def on_message(self, client, user, data):
         """
         Handles incoming MQTT messages synchronously (required by Paho MQTT).
 
-        - Calls the async function `handle_incoming_message` in the event loop.
-        - Ensures thread-safety when running async code inside a sync function.
+        - Paho reads the socket from the service's event loop, so this already runs on it.
+        - Only hands the raw topic and payload to the inbox, `_inbox_worker` does the processing.
+        - Drops the message if the inbox is full rather than stalling the network loop.
 
         Args:
             client: The MQTT client instance.
@@ -261,15 +763,9 @@ class MqttService:
             data: The received MQTT message containing topic and payload.
         """
         try:
-            # Try to get the running event loop
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # If no running loop, create a new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the async function in the event loop safely
-        loop.run_until_complete(self.handle_incoming_message(data))
+            self.inbox.put_nowait((data.topic, data.payload))
+        except asyncio.QueueFull:
+            logger.warning("Inbox full, dropping MQTT message on topic %s", data.topic)
 
  
 
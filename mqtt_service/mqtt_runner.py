@@ -2,7 +2,7 @@ import asyncio
 import logging
 import os
 from django.conf import settings
-from mqtt_service.mqtt_client import MqttService  # Import your MQTT service
+from mqtt_service.mqtt_client import MqttService, use_persistent_db_connections  # Import your MQTT service
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +11,22 @@ async def main():
     port = settings.MQTT_PORT
     username = settings.MQTT_USER
     password = settings.MQTT_PASS
+    payload_format = getattr(settings, "MQTT_PAYLOAD_FORMAT", "json")
 
-    mqtt_service = MqttService(broker=broker, port=port)
+    # Long-running worker without requests, don't reconnect to the database per query
+    use_persistent_db_connections()
+
+    mqtt_service = MqttService(broker=broker, port=port, payload_format=payload_format)
 
     try:
         await mqtt_service.connect(username=username, password=password)
         logger.info("MQTT Service started successfully.")
-    except Exception as e:
-        logger.error(f"Failed to start MQTT service: {e}")
+    except Exception:
+        logger.exception("Failed to start MQTT service")
+        return
+
+    # The MQTT client is served by this event loop, keep it running
+    await asyncio.Event().wait()
 
 if __name__ == "__main__":
     asyncio.run(main())
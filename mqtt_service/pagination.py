@@ -0,0 +1,18 @@
+# DRF Import's
+from rest_framework.pagination import CursorPagination
+
+class MqttCursorPagination(CursorPagination):
+    """
+    🔥 Cursor pagination for list endpoints.
+    🔥 Seeks from the cursor position instead of using OFFSET, so deep pages stay cheap.
+    """
+    page_size = 50
+
+class TopicPagination(MqttCursorPagination):
+    ordering = "-created_at"
+
+class SubscriptionPagination(MqttCursorPagination):
+    ordering = "-subscribed_at"
+
+class MessagePagination(MqttCursorPagination):
+    ordering = "-id"
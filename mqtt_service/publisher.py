@@ -0,0 +1,103 @@
+# Django Import's
+from django.conf import settings
+
+# Default Package Import's
+import threading
+
+import orjson
+import paho.mqtt.client as mqtt
+
+# One publisher connection per process, shared by all threads
+_publisher = None
+_publisher_lock = threading.Lock()
+
+# Set while the publisher is connected to the broker
+_connected = threading.Event()
+
+# Messages kept for sending while the broker is unreachable
+PUBLISH_QUEUE_SIZE = 10_000
+
+def get_publisher():
+    """
+    Returns the process's MQTT publisher, creating it on first use.
+
+    paho's network thread connects and reconnects in the background, so no
+    caller waits on the broker. QoS 1 messages published while it is
+    disconnected are queued and sent once the connection is up.
+    """
+
+    global _publisher
+
+    with _publisher_lock:
+        if _publisher is None:
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1)
+            client.username_pw_set(
+                getattr(settings, "MQTT_USER", None), getattr(settings, "MQTT_PASS", None)
+            )
+            # Bound the queue kept while the broker is unreachable
+            client.max_queued_messages_set(PUBLISH_QUEUE_SIZE)
+            client.on_connect = _on_connect
+            client.on_disconnect = _on_disconnect
+            client.connect_async(getattr(settings, "MQTT_BROKER", "mqtt.example.com"), getattr(settings, "MQTT_PORT", 1883))
+            client.loop_start()
+            _publisher = client
+
+    return _publisher
+
+def _on_connect(client, userdata, flags, rc):
+    """ Marks the publisher connected once the broker accepted it """
+    if rc == mqtt.CONNACK_ACCEPTED:
+        _connected.set()
+
+def _on_disconnect(client, userdata, rc):
+    """ Marks the publisher disconnected, paho reconnects it in the background """
+    _connected.clear()
+
+def wait_until_connected(timeout):
+    """
+    Waits for the process's MQTT publisher to be connected.
+
+    A new publisher only starts connecting in the background, so the first
+    caller in a process would otherwise always find it disconnected.
+
+    Args:
+        timeout (float): Seconds to wait at most.
+
+    Returns:
+        bool: Whether the publisher is connected.
+    """
+
+    get_publisher()
+    return _connected.wait(timeout)
+
+def encode_payload(data):
+    """ Encodes a chat payload in the configured MQTT_PAYLOAD_FORMAT """
+
+    if getattr(settings, "MQTT_PAYLOAD_FORMAT", "json") == "msgpack":
+        import ormsgpack
+        return ormsgpack.packb(data)
+
+    return orjson.dumps(data)
+
+def publish_message(message):
+    """
+    Queues a stored message for publishing to its MQTT topic with QoS 1.
+
+    The payload carries the message's `public_id`, so the MQTT service
+    does not store the message a second time when it receives it back.
+
+    Args:
+        message (Message): The stored message, it must have a topic.
+
+    Returns:
+        MQTTMessageInfo: paho's handle, wait on it to confirm the broker's ack.
+    """
+
+    payload = encode_payload({
+        "public_id": str(message.public_id),
+        "sender": message.sender_id,
+        "receiver": message.receiver_id,
+        "message": message.content,
+    })
+
+    return get_publisher().publish(str(message.topic_id), payload, qos=1)
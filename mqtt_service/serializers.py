@@ -1,23 +1,82 @@
 # DRF Import's
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
+
+# Django Import's
+from django.utils import timezone
 
 # App Import's
 from mqtt_service.models import Topic, Message, Subscription
 
-class TopicSerializer(serializers.ModelSerializer):
+# Default Package Import's
+import copy
+
+class CachedFieldsMixin:
+    """
+    🔥 Builds the ModelSerializer fields once per class.
+    🔥 Later instances get a copy instead of introspecting the model again.
+    """
+
+    def get_fields(self):
+        fields = type(self).__dict__.get("_cached_fields")
+        if fields is None:
+            fields = super().get_fields()
+            type(self)._cached_fields = fields
+        return copy.deepcopy(fields)
+
+# Fields are listed explicitly, the viewsets select only these columns
+
+class TopicSerializer(CachedFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Topic
-        fields = '__all__'
+        fields = ('id', 'name', 'is_group', 'is_active', 'created_at', 'updated_at')
 
-class SubscriptionSerializer(serializers.ModelSerializer):
+class SubscriptionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Subscription
-        fields = '__all__'
+        fields = ('id', 'subscribed_at', 'updated_at', 'user', 'topic')
+        # Only active subscriptions count as duplicates, inactive ones are reactivated by `create`
+        validators = [
+            UniqueTogetherValidator(queryset=Subscription.objects.filter(is_active=True), fields=('user', 'topic')),
+        ]
+
+    def create(self, validated_data):
+        """ 🔥 Reactivate an earlier, unsubscribed subscription instead of inserting a duplicate """
+        subscription, _ = Subscription.objects.update_or_create(
+            user=validated_data.get('user'), topic=validated_data.get('topic'),
+            defaults={'is_active': True, 'subscribed_at': timezone.now()},
+        )
+        return subscription
 
-class MessageSerializer(serializers.ModelSerializer):
+class BulkSubscribeSerializer(serializers.Serializer):
+    """ 🔥 Validates the users of `bulk_subscribe`, the topic is looked up by the view """
+
+    user_ids = serializers.ListField(child=serializers.IntegerField(), default=list)
+
+class MessageSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     
     class Meta:
         model = Message
-        fields = '__all__'
\ No newline at end of file
+        fields = (
+            'id', 'public_id', 'content', 'topic_name', 'created_at', 'updated_at', 'sender', 'receiver', 'topic',
+        )
+        # Always derived from `topic`, the MQTT worker stores the same value
+        read_only_fields = ('topic_name',)
+
+    def create(self, validated_data):
+        """ 🔥 Record the MQTT topic name of the message's topic """
+        validated_data['topic_name'] = self.topic_name(validated_data.get('topic'))
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """ 🔥 Keep the MQTT topic name in step with a changed topic """
+        if 'topic' in validated_data:
+            validated_data['topic_name'] = self.topic_name(validated_data['topic'])
+        return super().update(instance, validated_data)
+
+    @staticmethod
+    def topic_name(topic):
+        """ 🔥 The MQTT topic a topic's messages are published on, its ID """
+        return str(topic.pk) if topic else ''
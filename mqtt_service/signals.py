@@ -0,0 +1,44 @@
+# Django Import's
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# App Import's
+from mqtt_service.caching import invalidate_subscriptions
+from mqtt_service.models import Subscription, Topic
+
+# Fields that tie a subscription to its cached user and topic lists
+OWNER_FIELDS = {"user", "user_id", "topic", "topic_id"}
+
+@receiver(pre_save, sender=Subscription)
+def remember_subscription_owner(sender, instance, update_fields=None, **kwargs):
+    """
+    🔥 Records the stored user and topic of a subscription about to be saved.
+    🔥 An update may move it to another user or topic, whose old lists must be dropped as well.
+    """
+    instance._previous_owner = None
+    # Deferred-field saves pass attnames, explicit ones may pass either form
+    if instance._state.adding or (update_fields is not None and not OWNER_FIELDS & set(update_fields)):
+        return
+
+    instance._previous_owner = Subscription.objects.filter(pk=instance.pk).values_list("user_id", "topic_id").first()
+
+@receiver([post_save, post_delete], sender=Subscription)
+def invalidate_subscription_cache(sender, instance, **kwargs):
+    """
+    🔥 Drops the cached subscription lists of the affected users and topics.
+    """
+    user_ids, topic_ids = [instance.user_id], [instance.topic_id]
+
+    previous = getattr(instance, "_previous_owner", None)
+    if previous is not None:
+        user_ids.append(previous[0])
+        topic_ids.append(previous[1])
+
+    invalidate_subscriptions(user_ids=set(user_ids), topic_ids=set(topic_ids))
+
+@receiver([post_save, post_delete], sender=Topic)
+def invalidate_topic_cache(sender, instance, **kwargs):
+    """
+    🔥 Drops the cached subscriber list of the saved or deleted topic.
+    """
+    invalidate_subscriptions(topic_ids=[instance.pk])
@@ -0,0 +1,50 @@
+# Celery Import's
+from celery import shared_task
+
+# App Import's
+from mqtt_service.models import Message
+from mqtt_service import publisher
+
+# Default Package Import's
+import logging
+
+# Initialize Logger
+logger = logging.getLogger(__name__)
+
+# Seconds a task waits for the publisher to connect before retrying later
+CONNECT_TIMEOUT = 5
+
+@shared_task(
+    acks_late=True,
+    autoretry_for=(OSError, RuntimeError),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    max_retries=5,
+)
+def publish_message(message_id):
+    """
+    Publishes a stored message to its MQTT topic and waits for the broker's ack.
+
+    Args:
+        message_id (int): Primary key of the message to publish.
+    """
+
+    message = Message.objects.filter(id=message_id).only(
+        "public_id", "topic_id", "content", "sender_id", "receiver_id"
+    ).first()
+
+    if message is None or message.topic_id is None:
+        logger.warning("⚠️ Message %s has no topic to publish to", message_id)
+        return
+
+    # Retry later rather than queueing, paho would send a queued copy on reconnect as well
+    if not publisher.wait_until_connected(timeout=CONNECT_TIMEOUT):
+        raise RuntimeError("Not connected to the MQTT broker")
+
+    result = publisher.publish_message(message)
+    result.wait_for_publish(timeout=10)
+
+    if not result.is_published():
+        raise RuntimeError(f"Publishing message {message_id} timed out")
+
+    logger.info("📤 Published message %s to topic %s", message_id, message.topic_id)
@@ -1,3 +1,259 @@
-from django.test import TestCase
+# DRF Import's
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+# Django Import's
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+# App Import's
+from mqtt_service.models import Topic, Message, Subscription
+from mqtt_service.mqtt_client import MqttService
+
+# Default Package Import's
+from unittest import mock, skipIf
+import orjson
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+
+@override_settings(ROOT_URLCONF="mqtt_service.urls")
+class SubscriptionTests(APITestCase):
+    """ 🔥 Soft-deleted subscriptions and the cached subscription lists """
+
+    def setUp(self):
+        cache.clear()
+        user_model = get_user_model()
+        self.user = user_model.objects.create(username="alice", first_name="Alice")
+        self.other = user_model.objects.create(username="bob", first_name="Bob")
+        self.topic = Topic.objects.create(name="room")
+        self.client.force_authenticate(self.user)
+
+    def subscribe(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/subscriptions/", {"user": user.id, "topic": str(self.topic.id)}, format="json"
+            )
+        return response
+
+    def unsubscribe(self, subscription_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/subscriptions/{subscription_id}/")
+        return response
+
+    def test_unsubscribe_keeps_the_row_inactive(self):
+        subscription_id = self.subscribe(self.user).data["id"]
+
+        response = self.unsubscribe(subscription_id)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Subscription.objects.get(id=subscription_id).is_active)
+        self.assertEqual(self.unsubscribe(subscription_id).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_resubscribe_reactivates_the_same_row(self):
+        subscription_id = self.subscribe(self.user).data["id"]
+        self.unsubscribe(subscription_id)
+
+        response = self.subscribe(self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["id"], subscription_id)
+        self.assertEqual(Subscription.objects.filter(user=self.user, topic=self.topic).count(), 1)
+        self.assertTrue(Subscription.objects.get(id=subscription_id).is_active)
+
+    def test_subscribing_twice_is_rejected(self):
+        self.subscribe(self.user)
+
+        response = self.subscribe(self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_subscribe_reactivates_inactive_and_skips_active(self):
+        third = get_user_model().objects.create(username="carol", first_name="Carol")
+        active = Subscription.objects.create(user=self.user, topic=self.topic)
+        inactive = Subscription.objects.create(user=self.other, topic=self.topic, is_active=False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/subscriptions/bulk_subscribe/",
+                {"topic_id": str(self.topic.id), "user_ids": [self.user.id, self.other.id, third.id]},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        subscriptions = Subscription.objects.filter(topic=self.topic)
+        self.assertEqual(subscriptions.count(), 3)
+        self.assertTrue(all(subscription.is_active for subscription in subscriptions))
+
+        # The active row is left alone, the inactive one is reactivated in place
+        active_after = subscriptions.get(id=active.id)
+        self.assertEqual(active_after.subscribed_at, active.subscribed_at)
+        inactive_after = subscriptions.get(id=inactive.id)
+        self.assertGreater(inactive_after.subscribed_at, inactive.subscribed_at)
+
+    def test_bulk_subscribe_unknown_topic(self):
+        for topic_id in ("00000000-0000-0000-0000-000000000000", "not-a-uuid"):
+            response = self.client.post(
+                "/subscriptions/bulk_subscribe/", {"topic_id": topic_id, "user_ids": [self.user.id]}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_subscribe_malformed_user_ids(self):
+        for user_ids in (["x"], 5, [None]):
+            response = self.client.post(
+                "/subscriptions/bulk_subscribe/", {"topic_id": str(self.topic.id), "user_ids": user_ids}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Subscription.objects.exists())
+
+    def test_cached_lists_are_invalidated_on_unsubscribe(self):
+        subscription_id = self.subscribe(self.user).data["id"]
+        topic_url = f"/subscriptions/{self.topic.id}/topic_subscribers/"
+        upper_topic_url = f"/subscriptions/{str(self.topic.id).upper()}/topic_subscribers/"
+
+        # Fill the caches
+        self.assertEqual(len(self.client.get("/subscriptions/user_subscriptions/").json()), 1)
+        self.assertEqual(len(self.client.get(topic_url).json()), 1)
+        self.assertEqual(len(self.client.get(upper_topic_url).json()), 1)
+
+        self.unsubscribe(subscription_id)
+
+        self.assertEqual(self.client.get("/subscriptions/user_subscriptions/").json(), [])
+        self.assertEqual(self.client.get(topic_url).json(), [])
+        self.assertEqual(self.client.get(upper_topic_url).json(), [])
+
+    def test_cached_lists_are_invalidated_on_resubscribe(self):
+        subscription_id = self.subscribe(self.user).data["id"]
+        self.unsubscribe(subscription_id)
+        self.assertEqual(self.client.get("/subscriptions/user_subscriptions/").json(), [])
+
+        self.subscribe(self.user)
+
+        subscriptions = self.client.get("/subscriptions/user_subscriptions/").json()
+        self.assertEqual([subscription["id"] for subscription in subscriptions], [subscription_id])
+
+    def test_cached_lists_are_invalidated_on_move(self):
+        other_topic = Topic.objects.create(name="lobby")
+        subscription_id = self.subscribe(self.user).data["id"]
+        topic_url = f"/subscriptions/{self.topic.id}/topic_subscribers/"
+        self.assertEqual(len(self.client.get(topic_url).json()), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/subscriptions/{subscription_id}/", {"topic": str(other_topic.id)}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(topic_url).json(), [])
+        self.assertEqual(len(self.client.get(f"/subscriptions/{other_topic.id}/topic_subscribers/").json()), 1)
+
+    def test_topic_subscribers_unknown_topic(self):
+        for topic_id in ("00000000-0000-0000-0000-000000000000", "not-a-uuid"):
+            response = self.client.get(f"/subscriptions/{topic_id}/topic_subscribers/")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_topic_subscribers_existing_topic_without_subscribers(self):
+        response = self.client.get(f"/subscriptions/{self.topic.id}/topic_subscribers/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+
+
+@override_settings(ROOT_URLCONF="mqtt_service.urls")
+class MessageTests(APITestCase):
+    """ 🔥 Messages created through the REST API """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="alice", first_name="Alice")
+        self.topic = Topic.objects.create(name="room")
+        self.client.force_authenticate(self.user)
+
+    def test_topic_name_is_derived_from_the_topic(self):
+        response = self.client.post(
+            "/message/", {"topic": str(self.topic.id), "topic_name": "bogus/topic", "content": "hi"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["topic_name"], str(self.topic.id))
+
+    def test_topic_name_follows_a_changed_topic(self):
+        other = Topic.objects.create(name="other")
+        public_id = self.client.post(
+            "/message/", {"topic": str(self.topic.id), "content": "hi"}, format="json"
+        ).data["public_id"]
+
+        response = self.client.patch(f"/message/{public_id}/", {"topic": str(other.id)}, format="json")
+
+        self.assertEqual(response.data["topic_name"], str(other.id))
+
+
+class MqttServiceTests(TestCase):
+    """ 🔥 Handling and storing of incoming MQTT messages, without a broker """
+
+    def setUp(self):
+        user_model = get_user_model()
+        self.sender = user_model.objects.create(username="alice", first_name="Alice")
+        self.receiver = user_model.objects.create(username="bob", first_name="Bob")
+        self.topic = Topic.objects.create(name="room")
+
+    def service(self, payload_format="json"):
+        """ 🔥 Service whose publishers record (topic, payload) instead of sending """
+        service = MqttService("localhost", payload_format=payload_format)
+        service.published = []
+
+        def publish(topic, payload, qos=0):
+            service.published.append((topic, payload))
+            return mock.Mock(rc=0)
+
+        for client in service.publishers:
+            client.publish = publish
+        return service
+
+    def buffered(self, service):
+        """ 🔥 Messages queued for the next batched write """
+        messages = []
+        while not service._msg_buffer.empty():
+            messages.append(service._msg_buffer.get_nowait())
+        return messages
+
+    async def test_string_user_ids_resolve_to_users(self):
+        service = self.service()
+        payload = orjson.dumps({"sender": str(self.sender.id), "receiver": str(self.receiver.id), "message": "hi"})
+
+        await service.handle_incoming_message(str(self.topic.id), payload)
+
+        [message] = self.buffered(service)
+        self.assertEqual((message.sender_id, message.receiver_id), (self.sender.id, self.receiver.id))
+        self.assertEqual(service.published, [(f"notification/{self.receiver.id}", "New message from Alice: hi")])
+
+    @skipIf(ormsgpack is None, "ormsgpack is not installed")
+    async def test_msgpack_value_error_after_decoding_is_not_a_decode_failure(self):
+        service = self.service(payload_format="msgpack")
+        payload = ormsgpack.packb({"sender": self.sender.id, "message": "hi"})
+
+        with mock.patch.object(service, "_public_id", side_effect=ValueError("bad public_id")):
+            with self.assertLogs("mqtt_service.mqtt_client", "WARNING") as logs:
+                await service.handle_incoming_message(str(self.topic.id), payload)
+
+        self.assertIn("Error processing MQTT message: bad public_id", logs.output[0])
+        self.assertFalse(any("Failed to decode" in line for line in logs.output))
+
+    async def test_batch_with_a_deleted_topic_stores_the_other_rows(self):
+        service = self.service()
+        deleted = await Topic.objects.acreate(name="gone")
+        live_id, deleted_id = str(self.topic.id), str(deleted.id)
+        service._known_topics |= {live_id, deleted_id}
+        await deleted.adelete()
+
+        for topic_id in (live_id, deleted_id):
+            payload = orjson.dumps({"sender": self.sender.id, "message": topic_id})
+            await service.handle_incoming_message(topic_id, payload)
+        await service._store_failed_batch(self.buffered(service))
+
+        stored = {content: topic_id async for content, topic_id in Message.objects.values_list("content", "topic_id")}
+        self.assertEqual(stored, {live_id: self.topic.id, deleted_id: None})
+        self.assertNotIn(deleted_id, service._known_topics)
@@ -4,83 +4,91 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 
 # Django Import's
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 # App Import's
 from mqtt_service.models import (Topic, Message, Subscription)
-from mqtt_service.serializers import (TopicSerializer, MessageSerializer, SubscriptionSerializer)
+from mqtt_service.serializers import (
+    TopicSerializer, MessageSerializer, SubscriptionSerializer, BulkSubscribeSerializer
+)
+from mqtt_service import publisher
+from mqtt_service.pagination import (TopicPagination, MessagePagination, SubscriptionPagination)
+from mqtt_service.caching import (
+    USER_SUBSCRIPTIONS_KEY, TOPIC_SUBSCRIBERS_KEY, SUBSCRIPTIONS_CACHE_TIMEOUT, invalidate_subscriptions
+)
 
 # Default Package Import's
 import logging
+import uuid
+import orjson
+import paho.mqtt.client as mqtt
 
 # Initialize Logger
 logger = logging.getLogger(__name__)
 
+# Columns read by the subscription list fast path, in `_serialize_sub` order
+SUBSCRIPTION_ROW_FIELDS = ("id", "subscribed_at", "updated_at", "user_id", "topic_id")
+
+def _serialize_sub(row):
+    """ 🔥 Subscription row from `values_list(*SUBSCRIPTION_ROW_FIELDS)` as SubscriptionSerializer renders it """
+    subscription_id, subscribed_at, updated_at, user_id, topic_id = row
+    if settings.USE_TZ:
+        subscribed_at, updated_at = timezone.localtime(subscribed_at), timezone.localtime(updated_at)
+
+    return {
+        "id": subscription_id, "subscribed_at": subscribed_at, "updated_at": updated_at,
+        "user": user_id, "topic": topic_id,
+    }
+
+def _json(content, status=status.HTTP_200_OK):
+    """ 🔥 JSON response from pre-rendered bytes, skips DRF's content negotiation and renderer """
+    return HttpResponse(content, content_type="application/json", status=status)
+
 class TopicViewSet(viewsets.ModelViewSet):
     """ CRUD operations for MQTT Topics """
     
     queryset = Topic.objects.all()
     serializer_class = TopicSerializer
+    pagination_class = TopicPagination
+
+    def get_queryset(self):
+        """ 🔥 Select only the columns the serializer renders """
+        return super().get_queryset().only(*TopicSerializer.Meta.fields)
 
     def create(self, request, *args, **kwargs):
         """ 🔥 Create a new topic """
-        try:
-            serializer = self.get_serializer(data=request.data)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
 
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        except Exception as e:
-            return Response(
-                {"error": "Error creating topic."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def retrieve(self, request, *args, **kwargs):
         """ 🔥 Retrieve a specific topic """
-        try:
-            instance = self.get_object()
-
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        
-        except Exception as e:
-            return Response(
-                {"error": "Error retrieving topic."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def update(self, request, *args, **kwargs):
         """ 🔥 Update an existing topic """
-        try:
-            instance = self.get_object()
-            serializer = self.get_serializer(instance, data=request.data, partial=True)
-
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        except Exception as e:
-            return Response(
-                {"error": "Error updating topic."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def destroy(self, request, *args, **kwargs):
         """ 🔥 Delete a topic """
-        try:
-
-            instance = self.get_object()
-            instance.delete()
-            return Response({"message": "Topic deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
-        
-        except Exception as e:
-            return Response(
-                {"error": "Error deleting topic."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        instance = self.get_object()
+        instance.delete()
+        return Response({"message": "Topic deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
     """
@@ -88,54 +96,42 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
     """
     queryset = Subscription.objects.all()
     serializer_class = SubscriptionSerializer
+    pagination_class = SubscriptionPagination
+
+    def get_queryset(self):
+        """ 🔥 Active subscriptions, only the columns the serializer renders """
+        # `user` and `topic` render as primary keys read from their `_id` columns,
+        # so neither select_related nor a Prefetch is needed until the serializer nests them.
+        return super().get_queryset().filter(is_active=True).only(*SubscriptionSerializer.Meta.fields)
 
     def create(self, request, *args, **kwargs):
         """
         🔥 Create a mqtt subscription.
         🔥 Automatically subscribe the user to the MQTT topic.
         """
-        try:
-            serializer = self.get_serializer(data=request.data)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        except Exception as e:
-            return Response(
-                {'status': "Error subscribing to the topic."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-    
     def retrieve(self, request, *args, **kwargs):
         """
         🔥 Retrieve a single subscription by ID.
         """
-        try:
-
-            instance = self.get_object()
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        
-        except Exception as e:
-            return Response(
-                {'status': "Error retrieving subscription."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
 
     def destroy(self, request, *args, **kwargs):
         """
         🔥 Unsubscribe the user from the topic.
-        🔥 Delete the subscription to the topic.
+        🔥 Deactivates the subscription, the row is kept.
         """
-        try:
-            subscription = self.get_object()
-            subscription.delete()
-            return Response({'status': 'Unsubscribed successfully'}, status=status.HTTP_204_NO_CONTENT)
-        except Exception as e:
-            return Response(
-                {'status': "Error deleting subscription."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        subscription = self.get_object()
+        subscription.is_active = False
+        subscription.save(update_fields=["is_active", "updated_at"])
+        return Response({'status': 'Unsubscribed successfully'}, status=status.HTTP_204_NO_CONTENT)
     
     @action(detail=False, methods=['post'])
     def bulk_subscribe(self, request):
@@ -148,116 +144,155 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             "user_ids": [2, 3, 4, 5]
         }
         """
-        try:
-            topic_id = request.data.get("topic_id")
-            user_ids = request.data.get("user_ids", [])
+        serializer = BulkSubscribeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        topic_id = request.data.get("topic_id")
+        user_ids = serializer.validated_data["user_ids"]
+
+        # Validate users, only their IDs are needed
+        user_model = get_user_model()
+        valid_ids = list(user_model.objects.filter(id__in=user_ids).values_list("id", flat=True))
+
+        with transaction.atomic():
+            # Lock the topic, a concurrent delete waits until the subscriptions are committed
+            try:
+                topic = Topic.objects.select_for_update().only("id").get(pk=topic_id)
+            except (Topic.DoesNotExist, TypeError, ValueError, ValidationError):
+                raise Http404("No Topic matches the given query.")
+
+            # Read existing subscriptions once, only new users are inserted and only inactive ones updated
+            existing = dict(
+                Subscription.objects.filter(topic=topic, user_id__in=valid_ids).values_list("user_id", "is_active")
+            )
+            subscriptions = [
+                Subscription(user_id=user_id, topic_id=topic.id) for user_id in valid_ids if user_id not in existing
+            ]
+            inactive_ids = [user_id for user_id, is_active in existing.items() if not is_active]
 
-            # Validate topic existence
-            topic = get_object_or_404(Topic, pk=topic_id)
+            # ignore_conflicts still covers a single subscribe racing this request
+            Subscription.objects.bulk_create(subscriptions, batch_size=1000, ignore_conflicts=True)
 
-            # Validate users
-            user_model = get_user_model()
-            users = user_model.objects.filter(id__in=user_ids)
+            # Reactivate users who had unsubscribed
+            if inactive_ids:
+                Subscription.objects.filter(topic=topic, user_id__in=inactive_ids).update(
+                    is_active=True, subscribed_at=timezone.now(), updated_at=timezone.now(),
+                )
 
-            # Create subscriptions for all users
-            subscriptions = [
-                Subscription(user=user, topic=topic) for user in users
-            ]
-            Subscription.objects.bulk_create(subscriptions)
+        # bulk_create doesn't send post_save, drop the cached lists here
+        invalidate_subscriptions(user_ids=valid_ids, topic_ids=[topic.id])
 
-            return Response(
-                {"status": f"Subscribed {len(users)} users to topic {topic_id}"},
-                status=status.HTTP_201_CREATED,
-            )
-        except Exception as e:
-            return Response(
-                {'status': "Error subscribing multiple users."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response(
+            {"status": f"Subscribed {len(valid_ids)} users to topic {topic_id}"},
+            status=status.HTTP_201_CREATED,
+        )
         
     @action(detail=False, methods=['get'])
     def user_subscriptions(self, request):
         """
         🔥 Retrieve all topics subscribed by the authenticated user.
+        🔥 Cached per user as rendered JSON, invalidated when the user's subscriptions change.
         """
-        try:
-            subscriptions = Subscription.objects.filter(user=request.user)
-            serializer = self.get_serializer(subscriptions, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response(
-                {'status': "Error retrieving user subscriptions."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        # Anonymous users have no subscriptions, answer without touching the cache or database
+        if not request.user.is_authenticated:
+            return _json(b"[]")
+
+        # Empty lists are cached as well, users without subscriptions don't query until they subscribe
+        key = USER_SUBSCRIPTIONS_KEY.format(request.user.id)
+        data = cache.get(key)
+
+        if data is None:
+            subscriptions = self.get_queryset().filter(user=request.user).values_list(*SUBSCRIPTION_ROW_FIELDS)
+            data = orjson.dumps([_serialize_sub(row) for row in subscriptions], option=orjson.OPT_UTC_Z)
+            cache.set(key, data, timeout=SUBSCRIPTIONS_CACHE_TIMEOUT)
+
+        return _json(data)
         
     @action(detail=True, methods=['get'])
     def topic_subscribers(self, request, pk=None):
         """
-        🔥 Retrieve all users subscribed to a specific topic.
+        🔥 Retrieve all users subscribed to a specific topic, 404 if the topic doesn't exist.
+        🔥 Cached per topic as rendered JSON, invalidated when the topic's subscribers change.
         """
+        # Key the cache by the canonical UUID, the same form the invalidation uses
         try:
-            topic = get_object_or_404(Topic, pk=pk)
-            subscriptions = Subscription.objects.filter(topic=topic)
-            serializer = self.get_serializer(subscriptions, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response(
-                {'status': "Error retrieving users subscribed to the topic."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            topic_id = uuid.UUID(str(pk))
+        except ValueError:
+            raise Http404("No Topic matches the given query.")
+
+        key = TOPIC_SUBSCRIBERS_KEY.format(topic_id)
+        data = cache.get(key)
+
+        if data is None:
+            subscriptions = self.get_queryset().filter(topic_id=topic_id).values_list(*SUBSCRIPTION_ROW_FIELDS)
+            rows = [_serialize_sub(row) for row in subscriptions]
+
+            # Rows prove the topic exists, only an empty result needs the topic lookup
+            if not rows and not Topic.objects.filter(pk=topic_id).exists():
+                raise Http404("No Topic matches the given query.")
+
+            data = orjson.dumps(rows, option=orjson.OPT_UTC_Z)
+            cache.set(key, data, timeout=SUBSCRIPTIONS_CACHE_TIMEOUT)
+
+        return _json(data)
         
 class MessageViewSet(viewsets.ModelViewSet):
     """ 🔥 CRUD operations for messages with MQTT publishing """
     
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
+    pagination_class = MessagePagination
+    lookup_field = "public_id"
+
+    def get_queryset(self):
+        """ 🔥 Select only the columns the serializer renders """
+        return super().get_queryset().only(*MessageSerializer.Meta.fields)
 
     def create(self, request, *args, **kwargs):
         """ 🔥 Create and publish a new message """
-        try:
-             
-            serializer = self.get_serializer(data=request.data)
-
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        except Exception as e:
-            logger.error(f"Error creating message: {str(e)}")
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            message = serializer.save()
 
-            return Response({"error": "Error creating message."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            # Publish once the row is committed, never while the transaction is open
+            if message.topic_id is not None:
+                if getattr(settings, "ASYNC_MQTT", False):
+                    transaction.on_commit(lambda: self.publish(message))
+                elif getattr(settings, "MQTT_CELERY_PUBLISH", False):
+                    from mqtt_service.tasks import publish_message
+                    transaction.on_commit(lambda: publish_message.delay(message.id))
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def publish(self, message):
+        """
+        🔥 Hands the message to this process's MQTT connection without waiting for the broker.
+        🔥 The message is already stored, a full publish queue is logged rather than failing the request.
+        """
+        result = publisher.publish_message(message)
+        if result.rc == mqtt.MQTT_ERR_QUEUE_SIZE:
+            logger.warning("⚠️ MQTT publish queue is full, message %s was not published", message.public_id)
 
     def retrieve(self, request, *args, **kwargs):
         """ 🔥 Retrieve a specific message """
-        try:
-
-            instance = self.get_object()
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        
-        except Exception as e:
-            return Response({"error": "Error retrieving message."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def update(self, request, *args, **kwargs):
         """ 🔥 Update an existing message """
-        try:
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
 
-            instance = self.get_object()
-            serializer = self.get_serializer(instance, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        
-        except Exception as e:
-            return Response({"error": "Error updating message."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR,)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def destroy(self, request, *args, **kwargs):
         """ 🔥 Delete a message """
-        try:
-            instance = self.get_object()
-            instance.delete()
+        instance = self.get_object()
+        instance.delete()
 
-            return Response({"message": "Message deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
-        
-        except Exception as e:
-            return Response({"error": "Error deleting message."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({"message": "Message deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
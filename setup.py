@@ -6,8 +6,13 @@ setup(
     packages=find_packages(),  # Auto-detects all packages
     install_requires=[
         "paho-mqtt",
-        "Django>=3.2",
+        "orjson",
+        "Django>=4.1",
     ],
+    extras_require={
+        "msgpack": ["ormsgpack"],
+        "celery": ["celery>=5.0"],
+    },
     include_package_data=True,
     description="A pluggable Django app for MQTT-based chat and notifications.",
     long_description=open("README.md").read(),